@@ -0,0 +1,129 @@
+"""JSON codec benchmark on realistic payloads.
+
+Compares the stdlib baseline (what the code used before ``codec``) with the
+active ``codec`` backend for read payloads, chapterInfos responses and a
+large ``__INITIAL_STATE__`` page.
+
+    uv run python bench_codec.py
+    uv run --with orjson python bench_codec.py   # accelerated backend
+"""
+
+import argparse
+import json
+import random
+import timeit
+from typing import Any, Callable
+
+import codec
+from settings import DEFAULT_DATA
+from utils import extract_initial_state
+
+
+def make_read_payload() -> dict[str, Any]:
+    return dict(DEFAULT_DATA)
+
+
+def make_chapter_infos(chapters: int = 600) -> bytes:
+    updated = [
+        {
+            "chapterUid": 10000 + i,
+            "chapterIdx": i + 1,
+            "title": f"第{i + 1}章 三体问题与黑暗森林",
+            "wordCount": random.randint(0, 12000),
+            "level": 1,
+            "updateTime": 1700000000 + i,
+            "price": -1,
+            "paid": 0,
+        }
+        for i in range(chapters)
+    ]
+    body = {
+        "data": [
+            {
+                "bookId": "695233",
+                "book": {"bookId": "695233", "title": "三体", "author": "刘慈欣"},
+                "updated": updated,
+                "synckey": 123456,
+            }
+        ]
+    }
+    return json.dumps(body, ensure_ascii=False).encode("utf-8")
+
+
+def make_reader_page(target_bytes: int = 2 * 1024 * 1024) -> str:
+    chapters = json.loads(make_chapter_infos(800))["data"][0]["updated"]
+    state: dict[str, Any] = {
+        "reader": {"bookId": "695233", "chapterInfos": chapters},
+        "reviews": [],
+    }
+    filler = {"content": "这是一段用于填充页面体积的书评内容。" * 20, "likes": 42}
+    blob = json.dumps(state, ensure_ascii=False)
+    while len(blob.encode("utf-8")) < target_bytes:
+        state["reviews"].extend([filler] * 200)
+        blob = json.dumps(state, ensure_ascii=False)
+    return (
+        "<html><head></head><body><script>window.__INITIAL_STATE__="
+        f"{blob};(function(){{}})();</script></body></html>"
+    )
+
+
+def _bench(func: Callable[[], Any], min_time: float) -> float:
+    """Return mean microseconds per call."""
+    timer = timeit.Timer(func)
+    number, elapsed = timer.autorange()
+    while elapsed < min_time:
+        number *= 2
+        elapsed = timer.timeit(number)
+    return elapsed / number * 1e6
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the JSON codec.")
+    parser.add_argument("--min-time", type=float, default=0.5, help="seconds per case")
+    args = parser.parse_args(argv)
+
+    random.seed(0)
+    read_payload = make_read_payload()
+    chapter_body = make_chapter_infos()
+    page = make_reader_page()
+    state_blob = page[page.index("{") : page.rindex("};") + 1]
+
+    cases: list[tuple[str, Callable[[], Any] | None, Callable[[], Any]]] = [
+        (
+            "read payload dumps",
+            lambda: json.dumps(read_payload, separators=(",", ":")).encode("utf-8"),
+            lambda: codec.dumps(read_payload),
+        ),
+        (
+            f"chapterInfos loads ({len(chapter_body) // 1024} KiB)",
+            lambda: json.loads(chapter_body.decode("utf-8")),
+            lambda: codec.loads(chapter_body),
+        ),
+        (
+            f"initial state loads ({len(state_blob) // 1024} Ki chars)",
+            lambda: json.loads(state_blob),
+            lambda: codec.loads(state_blob),
+        ),
+        (
+            "extract_initial_state (page)",
+            None,
+            lambda: extract_initial_state(page),
+        ),
+    ]
+
+    print(f"codec backend: {codec.BACKEND}")
+    print(f"{'case':<38} {'stdlib us':>12} {'codec us':>12} {'speedup':>8}")
+    for name, baseline, current in cases:
+        current_us = _bench(current, args.min_time)
+        if baseline is None:
+            print(f"{name:<38} {'-':>12} {current_us:>12.1f} {'-':>8}")
+            continue
+        baseline_us = _bench(baseline, args.min_time)
+        print(
+            f"{name:<38} {baseline_us:>12.1f} {current_us:>12.1f} "
+            f"{baseline_us / current_us:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Offline replay of ``BudgetPlanner`` against a recorded timing trace.
+
+A trace is a JSON object::
+
+    {"budget_seconds": 20580, "requested_reads": 540,
+     "events": [["iter", 36.8, true], ["iter", 41.2, false], ["rest", 245.0], ...]}
+
+``iter`` entries are loop-iteration wall times (request, pacing sleep, pushes;
+``true`` when the read succeeded), ``rest`` entries are rest sleeps and mark
+session boundaries where the planner re-plans. Without ``--trace`` a fixed,
+seeded synthetic trace is used.
+
+    uv run python bench_planner.py
+    uv run python bench_planner.py --trace my_run.json
+    uv run python bench_planner.py --save-trace example_trace.json
+"""
+
+import argparse
+import json
+import random
+import sys
+from pathlib import Path
+from typing import Any
+
+from planner import BudgetPlanner
+from settings import load_settings
+
+
+def synthetic_trace(seed: int = 0) -> dict[str, Any]:
+    """Roughly 6h of reads: 31-40s pacing, slow outliers, failures, pushes, rests."""
+    rng = random.Random(seed)
+    events: list[list[Any]] = []
+    reads_since_rest = 0
+    session_reads = rng.randint(40, 80)
+    elapsed = 0.0
+    while elapsed < 8 * 3600:
+        seconds = rng.randint(31, 40) + rng.uniform(0.2, 1.5)
+        if rng.random() < 0.02:
+            seconds += rng.uniform(5, 30)  # 慢请求
+        ok = rng.random() >= 0.03
+        if not ok:
+            seconds = rng.uniform(0.5, 3.0)  # 失败后刷新 cookie / 修复 synckey
+        elif (reads_since_rest + 1) % 20 == 0:
+            seconds += rng.uniform(1, 4)  # 进度推送
+        events.append(["iter", round(seconds, 3), ok])
+        elapsed += seconds
+        if ok:
+            reads_since_rest += 1
+        if reads_since_rest >= session_reads:
+            rest = rng.randint(3, 6) * 60
+            events.append(["rest", float(rest)])
+            elapsed += rest
+            reads_since_rest = 0
+            session_reads = rng.randint(40, 80)
+    return {"budget_seconds": 20580, "requested_reads": 540, "events": events}
+
+
+def replay(trace: dict[str, Any], *, verbose: bool = True) -> dict[str, Any]:
+    budget = float(trace["budget_seconds"])
+    requested = int(trace["requested_reads"])
+    planner = BudgetPlanner(load_settings(), budget)
+    seconds_left = budget
+    done = 0
+    target = planner.plan(done_reads=0, requested_reads=requested, seconds_left=seconds_left)
+    if verbose:
+        print(f"initial plan: {target} reads (requested {requested}, budget {int(budget)}s)")
+    exhausted = False
+    for event in trace["events"]:
+        if done >= target:
+            break
+        if event[0] == "iter":
+            seconds, ok = float(event[1]), bool(event[2])
+            if seconds > seconds_left:
+                exhausted = True
+                break
+            seconds_left -= seconds
+            planner.record_iteration(seconds, succeeded=ok)
+            done += int(ok)
+        elif event[0] == "rest":
+            seconds = min(float(event[1]), seconds_left)
+            seconds_left -= seconds
+            planner.record_rest(seconds)
+            if seconds_left <= 0:
+                exhausted = True
+                break
+            new_target = planner.plan(
+                done_reads=done, requested_reads=requested, seconds_left=seconds_left
+            )
+            if verbose and new_target != target:
+                print(
+                    f"  re-plan at {done} reads, {int(seconds_left)}s left: "
+                    f"{target} -> {new_target} ({planner.per_read_seconds():.1f}s/read)"
+                )
+            target = new_target
+    report = planner.report(done_reads=done, seconds_left=seconds_left)
+    report.update(final_target=target, budget_exhausted=exhausted)
+    return report
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Replay BudgetPlanner on a timing trace.")
+    parser.add_argument("--trace", type=Path, help="JSON trace file (default: synthetic)")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the synthetic trace")
+    parser.add_argument("--save-trace", type=Path, help="write the synthetic trace and exit")
+    parser.add_argument(
+        "--min-utilisation", type=float, default=0.0, help="fail below this budget %%"
+    )
+    args = parser.parse_args(argv)
+
+    if args.trace:
+        trace = json.loads(args.trace.read_text(encoding="utf-8"))
+    else:
+        trace = synthetic_trace(args.seed)
+    if args.save_trace:
+        args.save_trace.write_text(json.dumps(trace), encoding="utf-8")
+        print(f"trace saved to {args.save_trace}")
+        return
+
+    report = replay(trace)
+    print(
+        f"planned {report['planned_reads']} reads / {report['planned_seconds']}s, "
+        f"done {report['done_reads']} reads / {report['used_seconds']}s "
+        f"of {report['budget_seconds']}s ({report['utilisation_pct']}%)"
+    )
+    if report["budget_exhausted"]:
+        sys.exit("planner overcommitted: budget ran out before the target was reached")
+    if (report["utilisation_pct"] or 0.0) < args.min_utilisation:
+        sys.exit(f"budget utilisation below {args.min_utilisation}%")
+    print("plan fits the budget")
+
+
+if __name__ == "__main__":
+    main()
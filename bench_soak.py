@@ -0,0 +1,198 @@
+"""Long-run soak benchmark for memory growth and per-iteration cost.
+
+Drives the real ``runner.run`` loop for thousands of reads against an
+in-process ``httpx.MockTransport``, with pacing sleeps and rests set to zero.
+Every ``--sample-every`` reads it records RSS, tracemalloc heap size and the
+mean wall time per read, then fails if memory or per-read time trends upward
+beyond the configured thresholds.
+
+    uv run python bench_soak.py
+    uv run python bench_soak.py --iterations 10000 --sample-every 250
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import gc
+import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+
+import httpx
+
+from runner import run
+from settings import load_settings
+
+
+BOOK_ID = "695233"
+CHAPTERS = [
+    {"chapterIdx": i, "chapterUid": 1000 + i, "wordCount": 3000 + 40 * i, "title": f"第{i}章"}
+    for i in range(1, 41)
+]
+
+
+@dataclass
+class Sample:
+    reads: int
+    elapsed: float
+    rss_bytes: int
+    heap_bytes: int
+
+
+def read_rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm", encoding="ascii") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # 非 Linux：退化为峰值 RSS（macOS 为字节，Linux 为 KiB）
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class StandIn:
+    """Mock WeRead endpoints; samples process state every N read requests."""
+
+    def __init__(self, sample_every: int) -> None:
+        self.sample_every = sample_every
+        self.reads = 0
+        self.samples: list[Sample] = []
+        self.started = time.perf_counter()
+
+    def _json(self, data: object, set_cookie: str | None = None) -> httpx.Response:
+        headers = {"Content-Type": "application/json"}
+        if set_cookie:
+            headers["Set-Cookie"] = set_cookie
+        return httpx.Response(200, content=json.dumps(data).encode("utf-8"), headers=headers)
+
+    def sample(self) -> None:
+        self.samples.append(
+            Sample(
+                reads=self.reads,
+                elapsed=time.perf_counter() - self.started,
+                rss_bytes=read_rss_bytes(),
+                heap_bytes=tracemalloc.get_traced_memory()[0],
+            )
+        )
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path.startswith("/web/reader/"):
+            state = {"reader": {"bookId": BOOK_ID, "chapterInfos": CHAPTERS}}
+            html = f"<script>window.__INITIAL_STATE__={json.dumps(state)};</script>"
+            return httpx.Response(200, text=html)
+        if path == "/web/book/getProgress":
+            return self._json({"book": {"appId": "wb0", "chapterIdx": 1, "chapterOffset": 0}})
+        if path == "/web/book/chapterInfos":
+            return self._json(
+                {"data": [{"bookId": BOOK_ID, "book": {"title": "soak"}, "updated": CHAPTERS}]}
+            )
+        if path == "/web/login/renewal":
+            return self._json({"succ": 1}, set_cookie="wr_skey=soak; Path=/")
+        if path == "/web/book/read":
+            self.reads += 1
+            if self.reads % self.sample_every == 0:
+                self.sample()
+            # 模拟服务端每次下发的会话 cookie，检查 cookie jar 是否增长
+            return self._json(
+                {"succ": 1, "synckey": self.reads},
+                set_cookie=f"wr_ql={self.reads % 7}; Path=/",
+            )
+        return httpx.Response(404)
+
+
+def slope(xs: list[float], ys: list[float]) -> float:
+    """Least-squares slope of ys over xs."""
+    n = len(xs)
+    mean_x = sum(xs) / n
+    mean_y = sum(ys) / n
+    var_x = sum((x - mean_x) ** 2 for x in xs)
+    if var_x == 0:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var_x
+
+
+def analyse(samples: list[Sample], warmup_fraction: float) -> dict[str, float]:
+    steady = samples[int(len(samples) * warmup_fraction) :]
+    if len(steady) < 4:
+        raise SystemExit("not enough samples; raise --iterations or lower --sample-every")
+    reads = [float(s.reads) for s in steady]
+    span = reads[-1] - reads[0]
+    per_read_ms = [
+        (b.elapsed - a.elapsed) / (b.reads - a.reads) * 1000
+        for a, b in zip(steady, steady[1:])
+    ]
+    quarter = max(1, len(per_read_ms) // 4)
+    first = sum(per_read_ms[:quarter]) / quarter
+    last = sum(per_read_ms[-quarter:]) / quarter
+    return {
+        "reads": span,
+        "heap_growth_mb": slope(reads, [float(s.heap_bytes) for s in steady]) * span / 2**20,
+        "rss_growth_mb": slope(reads, [float(s.rss_bytes) for s in steady]) * span / 2**20,
+        "per_read_ms_first": first,
+        "per_read_ms_last": last,
+        "per_read_ratio": last / first if first > 0 else 1.0,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Soak-test runner.run for leaks and slowdown.")
+    parser.add_argument("--iterations", type=int, default=3000, help="minimum reads to drive")
+    parser.add_argument("--sample-every", type=int, default=100)
+    parser.add_argument("--warmup", type=float, default=0.1, help="fraction of samples skipped")
+    parser.add_argument("--max-heap-growth-mb", type=float, default=2.0)
+    parser.add_argument("--max-rss-growth-mb", type=float, default=16.0)
+    parser.add_argument("--max-time-growth", type=float, default=1.5, help="last/first ratio")
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=args.log_level.upper())
+    for name in ("GITHUB_ACTIONS", "WXREAD_START_DELAY_MIN", "WXREAD_START_DELAY_MAX"):
+        os.environ.pop(name, None)
+    settings = dataclasses.replace(
+        load_settings(),
+        read_num=args.iterations,
+        push_method=None,
+        history_db=None,
+        status_port=None,
+        sleep_min_seconds=0,
+        sleep_max_seconds=0,
+        rest_minutes_min=0,
+        rest_minutes_max=0,
+    )
+
+    stand_in = StandIn(args.sample_every)
+    gc.collect()
+    tracemalloc.start()
+    stand_in.started = time.perf_counter()
+    asyncio.run(run(settings, transport=httpx.MockTransport(stand_in.handle)))
+    tracemalloc.stop()
+
+    result = analyse(stand_in.samples, args.warmup)
+    print(f"reads driven:        {stand_in.reads} ({len(stand_in.samples)} samples)")
+    print(f"heap growth (trend): {result['heap_growth_mb']:+.2f} MiB over {int(result['reads'])} reads")
+    print(f"rss growth (trend):  {result['rss_growth_mb']:+.2f} MiB")
+    print(
+        f"per-read time:       {result['per_read_ms_first']:.3f} ms -> "
+        f"{result['per_read_ms_last']:.3f} ms (x{result['per_read_ratio']:.2f})"
+    )
+
+    failures = []
+    if result["heap_growth_mb"] > args.max_heap_growth_mb:
+        failures.append(f"heap +{result['heap_growth_mb']:.2f} MiB")
+    if result["rss_growth_mb"] > args.max_rss_growth_mb:
+        failures.append(f"rss +{result['rss_growth_mb']:.2f} MiB")
+    if result["per_read_ratio"] > args.max_time_growth:
+        failures.append(f"per-read time x{result['per_read_ratio']:.2f}")
+    if failures:
+        sys.exit("soak regression: " + "; ".join(failures))
+    print("soak within thresholds")
+
+
+if __name__ == "__main__":
+    main()
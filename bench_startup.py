@@ -0,0 +1,185 @@
+"""Cold-start benchmark: module import time and time-to-first-request.
+
+Import time comes from ``python -X importtime -c "import main"``. Time to
+first request spawns ``main.py`` against a local stand-in server
+(``WXREAD_BASE_URL``) and measures spawn -> first HTTP request received.
+
+    uv run python bench_startup.py                  # measure and print
+    uv run python bench_startup.py --save-baseline  # record bench_startup.json
+    uv run python bench_startup.py --check          # exit 1 if slower than baseline
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent
+DEFAULT_BASELINE = ROOT / "bench_startup.json"
+
+
+def _child_env(**overrides: str) -> dict[str, str]:
+    env = dict(os.environ)
+    for name in (
+        "GITHUB_ACTIONS",
+        "http_proxy",
+        "https_proxy",
+        "HTTP_PROXY",
+        "HTTPS_PROXY",
+        "ALL_PROXY",
+        "all_proxy",
+    ):
+        env.pop(name, None)
+    env.update(
+        PUSH_METHOD="",
+        WXREAD_HISTORY_DB="",
+        WXREAD_START_DELAY_MIN="",
+        WXREAD_START_DELAY_MAX="",
+    )
+    env.update(overrides)
+    return env
+
+
+def measure_import() -> tuple[float, list[tuple[str, float]]]:
+    """Return (cumulative ms for ``import main``, top direct children by ms)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=ROOT,
+        env=_child_env(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total_ms = 0.0
+    children: list[tuple[str, float]] = []
+    pending: list[tuple[str, float]] = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line.split("|")
+        try:
+            cumulative_us = int(parts[1])
+        except ValueError:
+            continue
+        name = parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 1:
+            pending.append((name.strip(), cumulative_us / 1000))
+        elif depth == 0:
+            # importtime 先输出子模块，再输出父模块
+            if name.strip() == "main":
+                total_ms = cumulative_us / 1000
+                children = pending
+            pending = []
+    children.sort(key=lambda item: item[1], reverse=True)
+    return total_ms, children[:8]
+
+
+class _StandIn(BaseHTTPRequestHandler):
+    first_request = threading.Event()
+    first_request_at = 0.0
+
+    def _reply(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        if not _StandIn.first_request.is_set():
+            _StandIn.first_request_at = time.perf_counter()
+            _StandIn.first_request.set()
+        body = b"{}"
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = _reply
+    do_POST = _reply
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+def measure_first_request(timeout: float = 30.0) -> float:
+    """Spawn ``main.py`` and return ms until the stand-in sees its first request."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StandIn)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    _StandIn.first_request.clear()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "main.py"],
+        cwd=ROOT,
+        env=_child_env(WXREAD_BASE_URL=base_url),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        if not _StandIn.first_request.wait(timeout):
+            raise RuntimeError(f"main.py made no request within {timeout}s")
+        return (_StandIn.first_request_at - started) * 1000
+    finally:
+        proc.kill()
+        proc.wait()
+        server.shutdown()
+        server.server_close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="samples per metric (median)")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--check", action="store_true", help="fail on regression")
+    parser.add_argument(
+        "--tolerance", type=float, default=1.3, help="allowed slowdown factor vs baseline"
+    )
+    parser.add_argument(
+        "--slack-ms", type=float, default=20.0, help="absolute noise allowance per metric"
+    )
+    args = parser.parse_args(argv)
+
+    import_samples: list[float] = []
+    top_modules: list[tuple[str, float]] = []
+    first_request_samples: list[float] = []
+    for _ in range(max(1, args.runs)):
+        total_ms, top_modules = measure_import()
+        import_samples.append(total_ms)
+        first_request_samples.append(measure_first_request())
+
+    result = {
+        "import_ms": round(statistics.median(import_samples), 1),
+        "first_request_ms": round(statistics.median(first_request_samples), 1),
+    }
+    print(f"import main:         {result['import_ms']:.1f} ms (median of {len(import_samples)})")
+    for name, ms in top_modules:
+        print(f"  {name:<24} {ms:8.1f} ms")
+    print(f"time to 1st request: {result['first_request_ms']:.1f} ms")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+        print(f"baseline saved to {args.baseline}")
+    if args.check:
+        if not args.baseline.exists():
+            sys.exit(f"no baseline at {args.baseline}; run with --save-baseline first")
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        failures = []
+        for metric, value in result.items():
+            limit = baseline[metric] * args.tolerance + args.slack_ms
+            if value > limit:
+                failures.append(f"{metric}: {value:.1f} ms > {limit:.1f} ms")
+        if failures:
+            sys.exit("startup regression: " + "; ".join(failures))
+        print("startup within baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,79 @@
-import json
+import asyncio
 import logging
 import re
+import time
 from typing import Any
 
 import httpx
 
+import codec
+from monitor import LatencyTracker
 from settings import Settings
 from utils import collect_readers, extract_initial_state, extract_json_after_key, extract_safe_info
 
 
 logger = logging.getLogger(__name__)
 
+# reader 页面超过该字符数时，解析在工作线程中进行
+PARSE_OFFLOAD_THRESHOLD = 256 * 1024
+
+
+def parse_reader_html(html: str) -> tuple[str | None, bool, int]:
+    """Extract the progress bookId from a reader page.
+
+    Returns ``(progress_book_id, has_initial_state, readers_count)``; pure and
+    CPU-bound, so it can run in a worker thread for large pages.
+    """
+    reader_obj = None
+    readers: list[dict[str, Any]] = []
+    state_obj = extract_initial_state(html)
+    if state_obj:
+        readers = collect_readers(state_obj)
+        for item in readers:
+            if (
+                isinstance(item, dict)
+                and item.get("chapterInfos")
+                and (item.get("bookId") or item.get("book", {}).get("bookId"))
+            ):
+                reader_obj = item
+                break
+        if not reader_obj and readers:
+            reader_obj = readers[0]
+    if not reader_obj:
+        reader_obj = extract_json_after_key(html, '"reader"')
+
+    progress_book_id = None
+    if isinstance(reader_obj, dict):
+        progress_book_id = reader_obj.get("bookId") or reader_obj.get("book", {}).get(
+            "bookId"
+        )
+    if not progress_book_id:
+        match = re.search(r'"bookId"\s*:\s*"(\d+)"', html)
+        if match:
+            progress_book_id = match.group(1)
+    return (
+        str(progress_book_id) if progress_book_id else None,
+        bool(state_obj),
+        len(readers),
+    )
+
 
 class WeReadClient:
-    def __init__(self, settings: Settings, timeout: float = 30.0) -> None:
+    def __init__(
+        self,
+        settings: Settings,
+        timeout: float = 30.0,
+        latency: LatencyTracker | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
         self.settings = settings
+        self.latency = latency if latency is not None else LatencyTracker()
         self._client = httpx.AsyncClient(
             headers=dict(settings.headers),
             cookies=dict(settings.cookies),
             timeout=httpx.Timeout(timeout),
             follow_redirects=True,
+            transport=transport,
         )
 
     async def __aenter__(self) -> "WeReadClient":
@@ -32,45 +86,32 @@ class WeReadClient:
     def cookies(self) -> httpx.Cookies:
         return self._client.cookies
 
+    async def _request(
+        self, endpoint: str, method: str, url: str, **kwargs: Any
+    ) -> httpx.Response:
+        start = time.monotonic()
+        response = await self._client.request(method, url, **kwargs)
+        self.latency.record(endpoint, time.monotonic() - start)
+        return response
+
     async def get_reader_info(self, read_book_id: str) -> dict[str, str] | None:
         if not read_book_id:
             logger.error("❌ 未指定 reader bookId。")
             return None
         url = f"{self.settings.reader_url}/{read_book_id}"
         try:
-            response = await self._client.get(url)
+            response = await self._request("reader", "GET", url)
         except Exception as exc:
             logger.error("❌ 获取 reader 页面失败: %s", exc)
             return None
 
         html = response.text or ""
-        reader_obj = None
-        readers: list[dict[str, Any]] = []
-        state_obj = extract_initial_state(html)
-        if state_obj:
-            readers = collect_readers(state_obj)
-            for item in readers:
-                if (
-                    isinstance(item, dict)
-                    and item.get("chapterInfos")
-                    and (item.get("bookId") or item.get("book", {}).get("bookId"))
-                ):
-                    reader_obj = item
-                    break
-            if not reader_obj and readers:
-                reader_obj = readers[0]
-        if not reader_obj:
-            reader_obj = extract_json_after_key(html, '"reader"')
-
-        progress_book_id = None
-        if isinstance(reader_obj, dict):
-            progress_book_id = reader_obj.get("bookId") or reader_obj.get("book", {}).get(
-                "bookId"
-            )
-        if not progress_book_id:
-            match = re.search(r'"bookId"\s*:\s*"(\d+)"', html)
-            if match:
-                progress_book_id = match.group(1)
+        if len(html) >= PARSE_OFFLOAD_THRESHOLD:
+            # 大页面解析放到工作线程，避免阻塞事件循环上的推送与计时
+            parsed = await asyncio.to_thread(parse_reader_html, html)
+        else:
+            parsed = parse_reader_html(html)
+        progress_book_id, has_state, readers_count = parsed
         if not progress_book_id:
             logger.error("❌ reader 页面未解析到 progress bookId。")
             book_id_candidates = re.findall(r'"bookId"\s*:\s*"(\d+)"', html)[:5]
@@ -79,22 +120,22 @@ class WeReadClient:
                 url,
                 response.status_code,
                 len(html),
-                bool(state_obj),
-                len(readers),
+                has_state,
+                readers_count,
                 book_id_candidates or None,
             )
             return None
-        return {"progress_book_id": str(progress_book_id)}
+        return {"progress_book_id": progress_book_id}
 
     async def get_progress(self, book_id: str) -> dict[str, Any] | None:
         if not book_id:
             logger.error("❌ 未指定 bookId，无法获取阅读进度。")
             return None
         try:
-            response = await self._client.get(
-                self.settings.progress_url, params={"bookId": book_id}
+            response = await self._request(
+                "progress", "GET", self.settings.progress_url, params={"bookId": book_id}
             )
-            res_data = response.json()
+            res_data = codec.loads(response.content)
         except Exception as exc:
             logger.error("❌ 获取阅读进度失败: %s", exc)
             return None
@@ -121,14 +162,16 @@ class WeReadClient:
             logger.error("❌ 未指定 bookId，无法获取章节信息。")
             return None
 
-        payload = json.dumps({"bookIds": [str(book_id)]}, separators=(",", ":"))
-        response = await self._client.post(
+        payload = codec.dumps({"bookIds": [str(book_id)]})
+        response = await self._request(
+            "chapter_infos",
+            "POST",
             self.settings.fix_synckey_url,
             content=payload,
-            headers={"Content-Type": "application/json"},
+            headers=codec.JSON_HEADERS,
         )
         try:
-            res_data = response.json()
+            res_data = codec.loads(response.content)
         except ValueError:
             logger.error("❌ 章节信息返回非 JSON。")
             return None
@@ -170,11 +213,13 @@ class WeReadClient:
         return chapters, book_meta
 
     async def renew_cookie(self) -> str | None:
-        payload = json.dumps(self.settings.cookie_data, separators=(",", ":"))
-        response = await self._client.post(
+        payload = codec.dumps(self.settings.cookie_data)
+        response = await self._request(
+            "renewal",
+            "POST",
             self.settings.renew_url,
             content=payload,
-            headers={"Content-Type": "application/json"},
+            headers=codec.JSON_HEADERS,
         )
 
         wr_skey = response.cookies.get("wr_skey")
@@ -192,7 +237,7 @@ class WeReadClient:
             "found" if wr_skey else "missing",
         )
         try:
-            resp_json = response.json()
+            resp_json = codec.loads(response.content)
         except ValueError:
             resp_json = None
         if isinstance(resp_json, dict):
@@ -209,21 +254,25 @@ class WeReadClient:
     async def fix_no_synckey(self, book_id: str) -> None:
         if not book_id:
             return
-        payload = json.dumps({"bookIds": [str(book_id)]}, separators=(",", ":"))
-        await self._client.post(
+        payload = codec.dumps({"bookIds": [str(book_id)]})
+        await self._request(
+            "fix_synckey",
+            "POST",
             self.settings.fix_synckey_url,
             content=payload,
-            headers={"Content-Type": "application/json"},
+            headers=codec.JSON_HEADERS,
         )
 
     async def post_read(self, data: dict[str, Any]) -> dict[str, Any]:
-        payload = json.dumps(data, separators=(",", ":"))
-        response = await self._client.post(
+        payload = codec.dumps(data)
+        response = await self._request(
+            "read",
+            "POST",
             self.settings.read_url,
             content=payload,
-            headers={"Content-Type": "application/json"},
+            headers=codec.JSON_HEADERS,
         )
         try:
-            return response.json()
+            return codec.loads(response.content)
         except ValueError:
             return {"message": "non-json response", "status": response.status_code}
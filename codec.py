@@ -0,0 +1,40 @@
+"""Single JSON codec for request bodies, responses and embedded page state.
+
+Uses ``orjson`` when it is installed and falls back to the stdlib ``json``
+module otherwise. Both backends emit compact JSON bytes ready to be used as a
+request body; the stdlib path keeps ``\\uXXXX`` escapes, which is the faster
+C encoder path there and decodes to the same values.
+"""
+
+import json
+from typing import Any, Callable
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+if orjson is not None:
+
+    def dumps(obj: Any, *, default: Callable[[Any], Any] | None = None) -> bytes:
+        return orjson.dumps(obj, default=default)
+
+    def loads(data: bytes | bytearray | str) -> Any:
+        return orjson.loads(data)
+
+else:
+    _encoder = json.JSONEncoder(separators=(",", ":"))
+
+    def dumps(obj: Any, *, default: Callable[[Any], Any] | None = None) -> bytes:
+        if default is None:
+            return _encoder.encode(obj).encode("ascii")
+        return json.dumps(obj, separators=(",", ":"), default=default).encode("ascii")
+
+    def loads(data: bytes | bytearray | str) -> Any:
+        return json.loads(data)
@@ -0,0 +1,201 @@
+import argparse
+import json
+import logging
+import os
+import sqlite3
+from dataclasses import asdict, dataclass
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY_DB = "run_history.sqlite3"
+
+# 每次阅读尝试至多记一次；续期、初始化失败单独计数，不计入失败率
+READ_FAILURE_KINDS = ("read_fail", "no_synckey")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at TEXT NOT NULL,
+    ended_at TEXT NOT NULL,
+    duration_seconds REAL NOT NULL,
+    reads_attempted INTEGER NOT NULL,
+    reads_succeeded INTEGER NOT NULL,
+    minutes_credited REAL NOT NULL,
+    cookie_renewals INTEGER NOT NULL,
+    failures TEXT NOT NULL,
+    latency TEXT NOT NULL,
+    exit_reason TEXT NOT NULL,
+    exit_detail TEXT,
+    target_reads INTEGER,
+    budget_utilisation_pct REAL,
+    loop_lag_p99_ms REAL
+)
+"""
+
+
+@dataclass(frozen=True)
+class RunRecord:
+    started_at: str
+    ended_at: str
+    duration_seconds: float
+    reads_attempted: int
+    reads_succeeded: int
+    minutes_credited: float
+    cookie_renewals: int
+    failures: dict[str, int]
+    latency: dict[str, dict[str, float | int]]
+    exit_reason: str
+    exit_detail: str | None = None
+    target_reads: int | None = None
+    budget_utilisation_pct: float | None = None
+    loop_lag_p99_ms: float | None = None
+
+
+class HistoryStore:
+    """Append-only SQLite store with one row per job run."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path)
+        conn.row_factory = sqlite3.Row
+        conn.execute(SCHEMA)
+        return conn
+
+    def append(self, record: RunRecord) -> None:
+        row = asdict(record)
+        row["failures"] = json.dumps(record.failures, separators=(",", ":"))
+        row["latency"] = json.dumps(record.latency, separators=(",", ":"))
+        columns = ", ".join(row)
+        placeholders = ", ".join(f":{name}" for name in row)
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(f"INSERT INTO runs ({columns}) VALUES ({placeholders})", row)
+        finally:
+            conn.close()
+
+    def recent(self, limit: int = 20) -> list[RunRecord]:
+        """Return the latest ``limit`` runs, oldest first."""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT * FROM runs ORDER BY id DESC LIMIT ?", (limit,)
+            ).fetchall()
+        finally:
+            conn.close()
+        records = []
+        for row in reversed(rows):
+            values = dict(row)
+            values.pop("id")
+            values["failures"] = json.loads(values["failures"])
+            values["latency"] = json.loads(values["latency"])
+            records.append(RunRecord(**values))
+        return records
+
+
+def append_run(path: str | None, record: RunRecord) -> None:
+    """Persist ``record``; storage problems are logged, never raised."""
+    if not path:
+        return
+    try:
+        HistoryStore(path).append(record)
+    except (sqlite3.Error, OSError) as exc:
+        logger.warning("⚠️ 写入运行历史失败(%s): %s", path, exc)
+        return
+    logger.info("🗃️ 运行记录已写入：%s", path)
+
+
+def _read_p50(record: RunRecord) -> float | None:
+    stats = record.latency.get("read")
+    return float(stats["p50_ms"]) if stats else None
+
+
+def _failure_rate(record: RunRecord) -> float:
+    """Share of read attempts that failed, always within [0, 1]."""
+    if record.reads_attempted <= 0:
+        return 0.0
+    failed = sum(record.failures.get(kind, 0) for kind in READ_FAILURE_KINDS)
+    return min(1.0, failed / record.reads_attempted)
+
+
+def _mean(values: list[float]) -> float | None:
+    return sum(values) / len(values) if values else None
+
+
+def _fmt(value: float | None, suffix: str = "") -> str:
+    return "-" if value is None else f"{value:.1f}{suffix}"
+
+
+def format_trends(records: list[RunRecord]) -> str:
+    if not records:
+        return "No runs recorded."
+    lines = [
+        f"{'started_at':<20} {'dur':>6} {'ok/try':>9} {'min':>6} "
+        f"{'fail%':>6} {'read p50':>9} {'budget%':>8}  exit"
+    ]
+    for record in records:
+        lines.append(
+            f"{record.started_at[:19]:<20} "
+            f"{int(record.duration_seconds // 60):>5}m "
+            f"{f'{record.reads_succeeded}/{record.reads_attempted}':>9} "
+            f"{record.minutes_credited:>6.1f} "
+            f"{_failure_rate(record) * 100:>6.1f} "
+            f"{_fmt(_read_p50(record), 'ms'):>9} "
+            f"{_fmt(record.budget_utilisation_pct):>8}  "
+            f"{record.exit_reason}"
+        )
+
+    half = len(records) // 2
+    lines.append("")
+    if half:
+        older = _mean([v for r in records[:half] if (v := _read_p50(r)) is not None])
+        newer = _mean([v for r in records[half:] if (v := _read_p50(r)) is not None])
+        drift = (newer - older) / older * 100 if older and newer is not None else None
+        lines.append(
+            f"read p50 drift: {_fmt(older, 'ms')} -> {_fmt(newer, 'ms')}"
+            f" ({_fmt(drift, '%')})"
+        )
+    else:
+        lines.append("read p50 drift: need at least 2 runs")
+    lines.append(
+        f"failure rate: mean {_fmt(_mean([_failure_rate(r) * 100 for r in records]), '%')}"
+        f", last {_fmt(_failure_rate(records[-1]) * 100, '%')}"
+    )
+    utilisation = [
+        r.budget_utilisation_pct for r in records if r.budget_utilisation_pct is not None
+    ]
+    lines.append(f"budget utilisation: mean {_fmt(_mean(utilisation), '%')}")
+    exits: dict[str, int] = {}
+    for record in records:
+        exits[record.exit_reason] = exits.get(record.exit_reason, 0) + 1
+    lines.append(
+        "exit reasons: " + ", ".join(f"{k}={v}" for k, v in sorted(exits.items()))
+    )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Show WeRead-Runner run history trends.")
+    parser.add_argument(
+        "--db",
+        default=os.getenv("WXREAD_HISTORY_DB") or DEFAULT_HISTORY_DB,
+        help="SQLite history file (default: $WXREAD_HISTORY_DB or %(default)s)",
+    )
+    parser.add_argument("--last", type=int, default=20, help="number of runs to show")
+    parser.add_argument("--json", action="store_true", help="print raw records as JSON")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        parser.exit(1, f"history database not found: {args.db}\n")
+    records = HistoryStore(args.db).recent(args.last)
+    if args.json:
+        print(json.dumps([asdict(r) for r in records], ensure_ascii=False, indent=2))
+    else:
+        print(format_trends(records))
+
+
+if __name__ == "__main__":
+    main()
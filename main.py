@@ -1,14 +1,115 @@
 import asyncio
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
+import os
+import queue
+from datetime import datetime, timezone
 
 from runner import run
 from settings import load_settings
 
 
+TEXT_LOG_FORMAT = "%(asctime)s - %(levelname)-8s - %(message)s"
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Format records as one compact JSON object per line.
+
+    Structured values passed via ``extra={"fields": {...}}`` are merged into
+    the top-level object instead of being interpolated into the message.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        fields = getattr(record, "fields", None)
+        if isinstance(fields, dict):
+            entry.update(fields)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        # 异常堆栈单独放在 exc 字段，不混入 msg
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+class StructuredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that keeps the traceback in ``exc_text``.
+
+    The stock ``prepare`` merges the traceback into ``msg``; here the message
+    is interpolated on the caller side but the traceback stays separate, so
+    the text formatter still appends it and the JSON formatter emits ``exc``.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        # 不把 traceback 对象放进队列，避免延长栈帧生命周期
+        record.exc_info = None
+        return record
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = (os.getenv(name) or "").strip()
+    try:
+        return int(raw) if raw else default
+    except ValueError:
+        return default
+
+
 def setup_logging() -> None:
-    logging.basicConfig(
-        level=logging.INFO, format="%(asctime)s - %(levelname)-8s - %(message)s"
+    """Route all logging through a queue drained by a background writer thread.
+
+    Env:
+        WXREAD_LOG_LEVEL: root level (default INFO; DEBUG also logs read payloads)
+        WXREAD_LOG_FORMAT: ``text`` (default) or ``json`` for JSON lines
+        WXREAD_LOG_FILE: optional local log file with size-based rotation
+        WXREAD_LOG_MAX_BYTES / WXREAD_LOG_BACKUPS: rotation limits
+    """
+    level_name = (os.getenv("WXREAD_LOG_LEVEL") or "INFO").strip().upper()
+    level = logging.getLevelNamesMapping().get(level_name, logging.INFO)
+    if (os.getenv("WXREAD_LOG_FORMAT") or "").strip().lower() == "json":
+        formatter: logging.Formatter = JsonLinesFormatter()
+    else:
+        formatter = logging.Formatter(TEXT_LOG_FORMAT)
+
+    handlers: list[logging.Handler] = [logging.StreamHandler()]
+    log_file = (os.getenv("WXREAD_LOG_FILE") or "").strip()
+    if log_file:
+        handlers.append(
+            logging.handlers.RotatingFileHandler(
+                log_file,
+                maxBytes=_env_int("WXREAD_LOG_MAX_BYTES", 10 * 1024 * 1024),
+                backupCount=_env_int("WXREAD_LOG_BACKUPS", 3),
+                encoding="utf-8",
+            )
+        )
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
     )
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(StructuredQueueHandler(log_queue))
+    root.setLevel(level)
+    listener.start()
+    atexit.register(listener.stop)
 
 
 def main() -> None:
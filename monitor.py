@@ -0,0 +1,127 @@
+import asyncio
+import bisect
+import logging
+import math
+from collections import deque
+
+from utils import percentile
+
+
+logger = logging.getLogger(__name__)
+
+# 延迟直方图桶上界（秒）：0.1ms 起每档放大 10%，约 140 档覆盖到 60s
+LAG_BUCKET_BOUNDS = [0.0001 * 1.1**i for i in range(math.ceil(math.log(600000, 1.1)) + 1)]
+
+
+class LoopLagMonitor:
+    """Measure event-loop scheduling delay with a periodic wake-up task.
+
+    Each tick sleeps for ``interval`` seconds and records how late the loop
+    actually resumed it; a blocked loop (synchronous parsing, logging, ...)
+    shows up directly as lag. Samples go into a fixed log-bucket histogram,
+    so p50/p99/max all cover the whole run in constant memory (percentiles
+    are bucket upper bounds, within ~10%).
+    """
+
+    def __init__(self, interval: float = 0.5) -> None:
+        self.interval = interval
+        self._buckets = [0] * (len(LAG_BUCKET_BOUNDS) + 1)
+        self._count = 0
+        self._max_lag = 0.0
+        self._task: asyncio.Task[None] | None = None
+
+    async def __aenter__(self) -> "LoopLagMonitor":
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.stop()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="loop-lag-monitor")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.record(max(0.0, loop.time() - expected))
+
+    def record(self, lag: float) -> None:
+        self._buckets[bisect.bisect_left(LAG_BUCKET_BOUNDS, lag)] += 1
+        self._count += 1
+        if lag > self._max_lag:
+            self._max_lag = lag
+
+    def _percentile(self, pct: float) -> float:
+        if not self._count:
+            return 0.0
+        rank = max(1, math.ceil(pct / 100.0 * self._count))
+        seen = 0
+        for idx, count in enumerate(self._buckets):
+            seen += count
+            if seen >= rank:
+                if idx >= len(LAG_BUCKET_BOUNDS):
+                    return self._max_lag
+                return min(LAG_BUCKET_BOUNDS[idx], self._max_lag)
+        return self._max_lag
+
+    def summary(self) -> dict[str, float | int]:
+        """Return whole-run lag statistics in milliseconds."""
+        return {
+            "count": self._count,
+            "p50_ms": round(self._percentile(50) * 1000, 2),
+            "p99_ms": round(self._percentile(99) * 1000, 2),
+            "max_ms": round(self._max_lag * 1000, 2),
+        }
+
+    def log_summary(self) -> None:
+        stats = self.summary()
+        logger.info(
+            "🩺 事件循环延迟: samples=%s p50=%sms p99=%sms max=%sms",
+            stats["count"],
+            stats["p50_ms"],
+            stats["p99_ms"],
+            stats["max_ms"],
+        )
+
+
+class LatencyTracker:
+    """Keep a bounded window of request latencies per endpoint."""
+
+    def __init__(self, max_samples: int = 2048) -> None:
+        self.max_samples = max_samples
+        self._samples: dict[str, deque[float]] = {}
+        self._counts: dict[str, int] = {}
+
+    def record(self, endpoint: str, seconds: float) -> None:
+        samples = self._samples.get(endpoint)
+        if samples is None:
+            samples = self._samples[endpoint] = deque(maxlen=self.max_samples)
+        samples.append(seconds)
+        self._counts[endpoint] = self._counts.get(endpoint, 0) + 1
+
+    def summary(self) -> dict[str, dict[str, float | int]]:
+        """Return per-endpoint count and p50/p90/p99/max in milliseconds."""
+        result: dict[str, dict[str, float | int]] = {}
+        for endpoint, window in self._samples.items():
+            samples = list(window)
+            result[endpoint] = {
+                "count": self._counts[endpoint],
+                "p50_ms": round(percentile(samples, 50) * 1000, 1),
+                "p90_ms": round(percentile(samples, 90) * 1000, 1),
+                "p99_ms": round(percentile(samples, 99) * 1000, 1),
+                "max_ms": round(max(samples) * 1000, 1),
+            }
+        return result
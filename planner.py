@@ -0,0 +1,88 @@
+import math
+
+from settings import Settings
+
+
+class BudgetPlanner:
+    """Plan the read target from measured per-read cost and remaining budget.
+
+    The planner never reads the clock itself: callers feed it observed
+    iteration and rest durations plus the budget left, so recorded timings can
+    be replayed offline (see ``bench_planner.py``).
+    """
+
+    def __init__(self, settings: Settings, budget_seconds: float) -> None:
+        self.settings = settings
+        self.budget_seconds = float(budget_seconds)
+        self.iteration_seconds = 0.0
+        self.iterations = 0
+        self.successes = 0
+        self.rest_seconds: list[float] = []
+        self.planned_reads: int | None = None
+        self.planned_seconds: float | None = None
+
+    def record_iteration(self, seconds: float, *, succeeded: bool) -> None:
+        """Record the wall time of one loop iteration, rest sleep excluded.
+
+        Failed iterations (fix_no_synckey, cookie refresh) and push time are
+        included, so their cost is amortised over the successful reads.
+        """
+        self.iteration_seconds += max(0.0, float(seconds))
+        self.iterations += 1
+        if succeeded:
+            self.successes += 1
+
+    def record_rest(self, seconds: float) -> None:
+        self.rest_seconds.append(max(0.0, float(seconds)))
+
+    def per_read_seconds(self) -> float:
+        """Expected cost of one read, rests amortised, in seconds."""
+        settings = self.settings
+        if self.successes:
+            # 总耗时 / 成功次数：失败轮次和推送耗时都摊到每次成功阅读上
+            read_cost = self.iteration_seconds / self.successes
+        else:
+            read_cost = float(settings.sleep_max_seconds) + 2.0
+        if self.rest_seconds:
+            rest_cost = sum(self.rest_seconds) / len(self.rest_seconds)
+        else:
+            rest_cost = float(settings.rest_minutes_max * 60)
+        session_reads_min = max(
+            1, math.ceil(settings.session_minutes_min / settings.read_min_per_success)
+        )
+        return read_cost + rest_cost / float(session_reads_min)
+
+    def max_reads(self, seconds_left: float) -> int:
+        """How many more reads fit into ``seconds_left`` (grace already excluded)."""
+        if self.settings.read_min_per_success <= 0 or seconds_left <= 0:
+            return 0
+        per_read = self.per_read_seconds()
+        if per_read <= 0:
+            return 0
+        return max(1, int(seconds_left // per_read))
+
+    def plan(self, *, done_reads: int, requested_reads: int, seconds_left: float) -> int:
+        """Return the new total target, never above ``requested_reads``."""
+        remaining = self.max_reads(seconds_left)
+        target = min(requested_reads, done_reads + remaining) if remaining else done_reads
+        if self.planned_reads is None:
+            self.planned_reads = target
+            self.planned_seconds = min(
+                self.budget_seconds, target * self.per_read_seconds()
+            )
+        return target
+
+    def report(self, *, done_reads: int, seconds_left: float) -> dict[str, float | int | None]:
+        """Planned versus actual budget use; ``seconds_left`` excludes grace."""
+        used = max(0.0, self.budget_seconds - max(0.0, seconds_left))
+        return {
+            "planned_reads": self.planned_reads,
+            "done_reads": done_reads,
+            "planned_seconds": int(self.planned_seconds or 0),
+            "used_seconds": int(used),
+            "budget_seconds": int(self.budget_seconds),
+            "utilisation_pct": round(used / self.budget_seconds * 100, 1)
+            if self.budget_seconds > 0
+            else None,
+            "per_read_seconds": round(self.per_read_seconds(), 2),
+        }
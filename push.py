@@ -1,11 +1,12 @@
 import asyncio
-import json
 import logging
 import random
 from typing import Any, Awaitable, Callable
 
 import httpx
 
+import codec
+
 logger = logging.getLogger(__name__)
 
 
@@ -25,7 +26,7 @@ class PushNotification:
         self.telegram_url = "https://api.telegram.org/bot{}/sendMessage"
         self.server_chan_url = "https://sctapi.ftqq.com/{}.send"
         self.wxpusher_simple_url = "https://wxpusher.zjiecode.com/api/send/message/{}/{}"
-        self.headers = {"Content-Type": "application/json"}
+        self.headers = codec.JSON_HEADERS
         self.pushplus_token = pushplus_token
         self.telegram_bot_token = telegram_bot_token
         self.telegram_chat_id = telegram_chat_id
@@ -66,7 +67,7 @@ class PushNotification:
             async with httpx.AsyncClient(timeout=10) as client:
                 return await client.post(
                     self.pushplus_url,
-                    content=json.dumps(payload).encode("utf-8"),
+                    content=codec.dumps(payload),
                     headers=self.headers,
                 )
 
@@ -81,7 +82,9 @@ class PushNotification:
         async def try_send(use_proxy: bool) -> bool:
             proxy = self.proxy if use_proxy else None
             async with httpx.AsyncClient(timeout=30, proxy=proxy) as client:
-                response = await client.post(url, json=payload)
+                response = await client.post(
+                    url, content=codec.dumps(payload), headers=self.headers
+                )
                 logger.info("✅ Telegram响应: %s", response.text)
                 response.raise_for_status()
                 return True
@@ -118,7 +121,7 @@ class PushNotification:
             async with httpx.AsyncClient(timeout=10) as client:
                 return await client.post(
                     url,
-                    content=json.dumps(payload).encode("utf-8"),
+                    content=codec.dumps(payload),
                     headers=self.headers,
                 )
 
@@ -5,12 +5,12 @@ import math
 import os
 import random
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from client import WeReadClient
-from push import PushNotification
+from monitor import LatencyTracker, LoopLagMonitor
 from settings import Settings
 from utils import (
     advance_chapter_pos,
@@ -24,6 +24,13 @@ from utils import (
     pick_random_chapter,
 )
 
+if TYPE_CHECKING:
+    import httpx
+
+    # 推送、历史记录、预算规划仅在启用时才导入，缩短冷启动
+    from history import RunRecord
+    from push import PushNotification
+
 
 logger = logging.getLogger(__name__)
 
@@ -46,6 +53,98 @@ class ReadContext:
     current_summary: str
 
 
+@dataclass
+class RunStats:
+    started_at: datetime
+    started_mono: float
+    latency: LatencyTracker
+    reads_attempted: int = 0
+    reads_succeeded: int = 0
+    cookie_renewals: int = 0
+    target_reads: int | None = None
+    failures: dict[str, int] = field(default_factory=dict)
+    exit_reason: str = "stopped"
+    exit_detail: str | None = None
+    budget_utilisation_pct: float | None = None
+    # 以下为实时状态，仅供状态接口读取
+    phase: str = "starting"
+    ctx: ReadContext | None = None
+    time_budget: "TimeBudget | None" = None
+    session_minutes: float = 0.0
+    session_target_minutes: int | None = None
+    rest_until_mono: float | None = None
+    last_error: dict[str, Any] | None = None
+
+    def add_failure(self, kind: str, detail: Any = None) -> None:
+        self.failures[kind] = self.failures.get(kind, 0) + 1
+        self.last_error = {
+            "kind": kind,
+            "detail": detail,
+            "at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+
+    def snapshot(self) -> dict[str, Any]:
+        now_mono = time.monotonic()
+        ctx = self.ctx
+        budget = self.time_budget
+        rest_left = None
+        if self.phase == "resting" and self.rest_until_mono is not None:
+            rest_left = max(0, int(self.rest_until_mono - now_mono))
+        return {
+            "phase": self.phase,
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "uptime_seconds": int(now_mono - self.started_mono),
+            "chapter": {
+                "idx": ctx.current_idx,
+                "offset": ctx.current_offset,
+                "title": ctx.current_summary,
+            }
+            if ctx is not None
+            else None,
+            "reads": {
+                "succeeded": self.reads_succeeded,
+                "attempted": self.reads_attempted,
+                "target": self.target_reads,
+            },
+            "session": {
+                "minutes": self.session_minutes,
+                "target_minutes": self.session_target_minutes,
+                "rest_seconds_left": rest_left,
+            },
+            "budget": {
+                "seconds_left": int(budget.seconds_left()),
+                "max_runtime_seconds": budget.max_runtime_seconds,
+                "grace_seconds": budget.grace_seconds,
+            }
+            if budget is not None
+            else None,
+            "cookie_renewals": self.cookie_renewals,
+            "failures": dict(self.failures),
+            "last_error": self.last_error,
+            "latency": self.latency.summary(),
+        }
+
+    def to_record(self, settings: Settings, loop_lag_p99_ms: float | None) -> "RunRecord":
+        from history import RunRecord
+
+        return RunRecord(
+            started_at=self.started_at.isoformat(timespec="seconds"),
+            ended_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            duration_seconds=round(time.monotonic() - self.started_mono, 1),
+            reads_attempted=self.reads_attempted,
+            reads_succeeded=self.reads_succeeded,
+            minutes_credited=self.reads_succeeded * settings.read_min_per_success,
+            cookie_renewals=self.cookie_renewals,
+            failures=dict(self.failures),
+            latency=self.latency.summary(),
+            exit_reason=self.exit_reason,
+            exit_detail=self.exit_detail,
+            target_reads=self.target_reads,
+            budget_utilisation_pct=self.budget_utilisation_pct,
+            loop_lag_p99_ms=loop_lag_p99_ms,
+        )
+
+
 @dataclass(frozen=True)
 class TimeBudget:
     deadline_mono: float
@@ -97,28 +196,33 @@ def get_time_budget() -> TimeBudget | None:
     )
 
 
-def estimate_max_reads_by_time_budget(settings: Settings, time_budget: TimeBudget) -> int:
-    if settings.read_min_per_success <= 0:
-        return 0
-    available = time_budget.max_sleep_seconds()
-    if available <= 0:
-        return 0
+def normalize_push_method(method: str | None) -> str | None:
+    if not method:
+        return None
+    method_norm = method.strip().strip('"').strip("'").lower()
+    return method_norm if method_norm in VALID_PUSH_METHODS else None
 
-    session_reads_min = max(
-        1, math.ceil(settings.session_minutes_min / settings.read_min_per_success)
-    )
-    rest_overhead_per_read = float(settings.rest_minutes_max * 60) / float(session_reads_min)
-    per_read_seconds = float(settings.sleep_max_seconds) + 2.0 + rest_overhead_per_read
-    if per_read_seconds <= 0:
-        return 0
 
-    return max(1, int(available // per_read_seconds))
+def build_notifier(settings: Settings) -> "PushNotification | None":
+    if normalize_push_method(settings.push_method) is None:
+        return None
+    from push import PushNotification
+
+    return PushNotification(
+        pushplus_token=settings.pushplus_token,
+        telegram_bot_token=settings.telegram_bot_token,
+        telegram_chat_id=settings.telegram_chat_id,
+        wxpusher_spt=settings.wxpusher_spt,
+        serverchan_spt=settings.serverchan_spt,
+        http_proxy=settings.http_proxy,
+        https_proxy=settings.https_proxy,
+    )
 
 
 async def safe_push(
     content: str,
     method: str | None,
-    notifier: PushNotification,
+    notifier: "PushNotification | None",
     *,
     time_budget: TimeBudget | None = None,
     final: bool = False,
@@ -126,8 +230,8 @@ async def safe_push(
     if not method:
         logger.info("ℹ️ PUSH_METHOD 为空，跳过推送。")
         return False
-    method_norm = method.strip().strip('"').strip("'").lower()
-    if method_norm not in VALID_PUSH_METHODS:
+    method_norm = normalize_push_method(method)
+    if method_norm is None or notifier is None:
         logger.warning("⚠️ PUSH_METHOD 无效(%s)，跳过推送。", method)
         return False
 
@@ -170,7 +274,7 @@ async def push_early_exit(
     reason: str,
     total_minutes: float,
     settings: Settings,
-    notifier: PushNotification,
+    notifier: "PushNotification | None",
     time_budget: TimeBudget | None,
 ) -> None:
     """Push notification for early exit due to time budget."""
@@ -225,11 +329,13 @@ def get_start_delay_seconds(settings: Settings) -> int:
     return random.randint(min_val, max_val)
 
 
-async def refresh_cookie(client: WeReadClient) -> bool:
+async def refresh_cookie(client: WeReadClient, stats: RunStats | None = None) -> bool:
     logger.info("🍪 刷新cookie")
     new_skey = await client.renew_cookie()
     if new_skey:
         client.cookies["wr_skey"] = new_skey
+        if stats is not None:
+            stats.cookie_renewals += 1
         logger.info("✅ 密钥刷新成功，新密钥：%s", new_skey)
         logger.info("🔄 重新本次阅读。")
         return True
@@ -238,6 +344,8 @@ async def refresh_cookie(client: WeReadClient) -> bool:
     )
     logger.error("💡 请重新登录微信读书网页版，从 Chrome DevTools 复制新的 curl bash 并更新环境变量。")
     logger.warning("⚠️ 刷新失败，继续使用旧 cookie 尝试。")
+    if stats is not None:
+        stats.add_failure("renew_fail", "无法获取新密钥")
     return False
 
 
@@ -338,18 +446,53 @@ async def initialize_context(
     return ctx, stopped_reason
 
 
-async def run(settings: Settings) -> None:
-    notifier = PushNotification(
-        pushplus_token=settings.pushplus_token,
-        telegram_bot_token=settings.telegram_bot_token,
-        telegram_chat_id=settings.telegram_chat_id,
-        wxpusher_spt=settings.wxpusher_spt,
-        serverchan_spt=settings.serverchan_spt,
-        http_proxy=settings.http_proxy,
-        https_proxy=settings.https_proxy,
+async def run(
+    settings: Settings, *, transport: "httpx.AsyncBaseTransport | None" = None
+) -> None:
+    stats = RunStats(
+        started_at=datetime.now(timezone.utc),
+        started_mono=time.monotonic(),
+        latency=LatencyTracker(),
     )
+    async with LoopLagMonitor() as lag_monitor:
+        status_server = None
+        if settings.status_port is not None:
+            from status import StatusServer
+
+            status_server = StatusServer(
+                settings.status_port,
+                lambda: {**stats.snapshot(), "loop_lag": lag_monitor.summary()},
+            )
+            await status_server.start()
+        try:
+            await _run_job(settings, stats, transport)
+        except BaseException as exc:
+            stats.exit_reason = "error"
+            stats.exit_detail = repr(exc)
+            raise
+        finally:
+            stats.phase = "finished"
+            if status_server is not None:
+                await status_server.stop()
+            lag_monitor.log_summary()
+            if settings.history_db:
+                from history import append_run
+
+                append_run(
+                    settings.history_db,
+                    stats.to_record(settings, lag_monitor.summary()["p99_ms"]),
+                )
+
+
+async def _run_job(
+    settings: Settings,
+    stats: RunStats,
+    transport: "httpx.AsyncBaseTransport | None" = None,
+) -> None:
+    notifier = build_notifier(settings)
 
     time_budget = get_time_budget()
+    stats.time_budget = time_budget
     if time_budget is not None:
         logger.info(
             "⏳ GitHub Actions 时间预算已启用：max_runtime=%ss grace=%ss",
@@ -375,16 +518,20 @@ async def run(settings: Settings) -> None:
             notifier,
             time_budget=time_budget,
         )
+        stats.phase = "delay"
         slept_ok, _ = await sleep_with_budget(start_delay_seconds, time_budget=time_budget)
         if not slept_ok and time_budget is not None:
             finished_reason = "接近 GitHub Actions 6 小时上限，启动延迟未完成，提前结束。"
 
     if finished_reason and time_budget is not None and time_budget.should_exit():
+        stats.exit_reason, stats.exit_detail = "budget", finished_reason
         await push_early_exit(finished_reason, 0, settings, notifier, time_budget)
         return
 
-    async with WeReadClient(settings) as client:
-        await refresh_cookie(client)
+    async with WeReadClient(
+        settings, latency=stats.latency, transport=transport
+    ) as client:
+        await refresh_cookie(client, stats)
 
         data = dict(settings.data_template)
         index = 1
@@ -395,8 +542,16 @@ async def run(settings: Settings) -> None:
         target_reads_original = random.randint(min_reads, max_reads)
         target_reads = target_reads_original
         target_reads_note = None
+        planner = None
         if time_budget is not None:
-            max_reads_by_budget = estimate_max_reads_by_time_budget(settings, time_budget)
+            from planner import BudgetPlanner
+
+            planner = BudgetPlanner(settings, time_budget.max_sleep_seconds())
+            max_reads_by_budget = planner.plan(
+                done_reads=0,
+                requested_reads=target_reads_original,
+                seconds_left=time_budget.max_sleep_seconds(),
+            )
             if max_reads_by_budget <= 0:
                 finished_reason = "接近 GitHub Actions 6 小时上限，剩余时间不足以继续阅读，提前结束。"
             elif target_reads > max_reads_by_budget:
@@ -410,7 +565,9 @@ async def run(settings: Settings) -> None:
 
         target_minutes = target_reads * settings.read_min_per_success
 
+        stats.target_reads = target_reads
         if finished_reason and time_budget is not None and time_budget.should_exit():
+            stats.exit_reason, stats.exit_detail = "budget", finished_reason
             await push_early_exit(finished_reason, 0, settings, notifier, time_budget)
             return
 
@@ -435,6 +592,8 @@ async def run(settings: Settings) -> None:
             settings.read_num,
         )
 
+        stats.phase = "initializing"
+        stats.session_target_minutes = session_target_minutes
         ctx, stopped_reason = await initialize_context(
             settings,
             client,
@@ -479,6 +638,8 @@ async def run(settings: Settings) -> None:
             )
 
         if not ctx or stopped_reason:
+            stats.add_failure("init_fail", stopped_reason)
+            stats.exit_detail = stopped_reason
             total_minutes = success_count * settings.read_min_per_success
             if stopped_reason:
                 logger.error("🛑 阅读已停止：%s", stopped_reason)
@@ -493,7 +654,21 @@ async def run(settings: Settings) -> None:
                 )
             return
 
+        stats.ctx = ctx
+        stats.phase = "reading"
+        iteration_start = None
+        iteration_ok = False
+        rest_slept = 0.0
         while index <= target_reads:
+            # 上一轮的完整耗时（含失败重试、推送，扣除休息本身）计入规划
+            now_mono = time.monotonic()
+            if planner is not None and iteration_start is not None:
+                planner.record_iteration(
+                    now_mono - iteration_start - rest_slept, succeeded=iteration_ok
+                )
+            iteration_start = now_mono
+            iteration_ok = False
+            rest_slept = 0.0
             if time_budget is not None and time_budget.should_exit():
                 finished_reason = "接近 GitHub Actions 6 小时上限，为避免 job 超时失败，提前结束。"
                 break
@@ -529,15 +704,44 @@ async def run(settings: Settings) -> None:
             ).hexdigest()
             ctx.data["s"] = cal_hash(encode_data(ctx.data))
 
-            logger.info("⏱️ 尝试第 %s 次阅读...", index)
-            logger.info("📕 data: %s", ctx.data)
+            logger.debug("📕 data: %s", ctx.data)
+            request_start = time.monotonic()
             res_data = await client.post_read(ctx.data)
-            logger.info("📕 response: %s", res_data)
+            stats.reads_attempted += 1
+            latency_ms = int((time.monotonic() - request_start) * 1000)
+            logger.debug("📕 response: %s", res_data)
+            if "succ" in res_data:
+                read_result = "ok" if "synckey" in res_data else "no_synckey"
+            else:
+                read_result = "fail"
+            logger.info(
+                "⏱️ 第 %s 次阅读: result=%s ci=%s co=%s latency=%sms",
+                index,
+                read_result,
+                ctx.data["ci"],
+                ctx.data["co"],
+                latency_ms,
+                extra={
+                    "fields": {
+                        "event": "read",
+                        "index": index,
+                        "result": read_result,
+                        "ci": ctx.data["ci"],
+                        "co": ctx.data["co"],
+                        "latency_ms": latency_ms,
+                        "success_count": success_count,
+                        "target_reads": target_reads,
+                        "resp": extract_safe_info(res_data),
+                    }
+                },
+            )
 
             if "succ" in res_data:
                 if "synckey" in res_data:
                     interval = ctx.data["rt"]
                     success_count += 1
+                    iteration_ok = True
+                    stats.reads_succeeded = success_count
                     index += 1
 
                     step = calc_read_step(interval, current_word_count)
@@ -580,6 +784,7 @@ async def run(settings: Settings) -> None:
                                 ctx.current_summary = next_chapter["title"]
 
                     session_minutes += settings.read_min_per_success
+                    stats.session_minutes = session_minutes
                     if session_minutes >= session_target_minutes:
                         rest_minutes = random.randint(
                             settings.rest_minutes_min, settings.rest_minutes_max
@@ -597,9 +802,12 @@ async def run(settings: Settings) -> None:
                             notifier,
                             time_budget=time_budget,
                         )
-                        slept_ok, _ = await sleep_with_budget(
+                        stats.phase = "resting"
+                        stats.rest_until_mono = time.monotonic() + rest_minutes * 60
+                        slept_ok, rest_slept = await sleep_with_budget(
                             rest_minutes * 60, time_budget=time_budget
                         )
+                        stats.phase = "reading"
                         if not slept_ok and time_budget is not None:
                             finished_reason = (
                                 "接近 GitHub Actions 6 小时上限，休息被中断，提前结束。"
@@ -609,6 +817,25 @@ async def run(settings: Settings) -> None:
                         session_target_minutes = random.randint(
                             settings.session_minutes_min, settings.session_minutes_max
                         )
+                        stats.session_minutes = session_minutes
+                        stats.session_target_minutes = session_target_minutes
+                        if planner is not None and time_budget is not None:
+                            planner.record_rest(rest_slept)
+                            new_target = planner.plan(
+                                done_reads=success_count,
+                                requested_reads=target_reads_original,
+                                seconds_left=time_budget.max_sleep_seconds(),
+                            )
+                            if new_target != target_reads:
+                                logger.info(
+                                    "⏳ 按实测耗时重新规划目标：%s -> %s（单次≈%.1fs）",
+                                    target_reads,
+                                    new_target,
+                                    planner.per_read_seconds(),
+                                )
+                                target_reads = new_target
+                                stats.target_reads = target_reads
+                                target_minutes = target_reads * settings.read_min_per_success
                         await safe_push(
                             "✅ 休息结束，继续阅读\n"
                             f"下一轮目标：{session_target_minutes} 分钟",
@@ -661,10 +888,12 @@ async def run(settings: Settings) -> None:
                         last_progress_push_ts = now_ts
                 else:
                     logger.warning("❌ 无synckey, 尝试修复...")
+                    stats.add_failure("no_synckey", extract_safe_info(res_data))
                     await client.fix_no_synckey(ctx.progress_book_id)
             else:
                 logger.warning("❌ 阅读失败，尝试刷新cookie...")
-                refresh_ok = await refresh_cookie(client)
+                stats.add_failure("read_fail", extract_safe_info(res_data))
+                refresh_ok = await refresh_cookie(client, stats)
                 if not refresh_ok:
                     safe_info = extract_safe_info(res_data) or {}
                     reason_parts = ["阅读接口失败且刷新cookie失败，已停止。"]
@@ -674,6 +903,27 @@ async def run(settings: Settings) -> None:
                     break
 
         total_minutes = success_count * settings.read_min_per_success
+        if planner is not None and time_budget is not None:
+            budget_report = planner.report(
+                done_reads=success_count, seconds_left=time_budget.max_sleep_seconds()
+            )
+            logger.info(
+                "⏳ 时间预算：计划 %s 次/%ss，实际 %s 次/%ss，利用率 %s%%（单次≈%ss）",
+                budget_report["planned_reads"],
+                budget_report["planned_seconds"],
+                budget_report["done_reads"],
+                budget_report["used_seconds"],
+                budget_report["utilisation_pct"],
+                budget_report["per_read_seconds"],
+                extra={"fields": {"event": "budget", **budget_report}},
+            )
+            stats.budget_utilisation_pct = budget_report["utilisation_pct"]
+        if stopped_reason:
+            stats.exit_reason, stats.exit_detail = "stopped", stopped_reason
+        elif finished_reason:
+            stats.exit_reason, stats.exit_detail = "budget", finished_reason
+        else:
+            stats.exit_reason = "completed"
         if stopped_reason:
             logger.error("🛑 阅读已停止：%s", stopped_reason)
             await safe_push(
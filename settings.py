@@ -76,6 +76,8 @@ class Settings:
     start_delay_max_raw: str | None
     http_proxy: str | None
     https_proxy: str | None
+    history_db: str | None
+    status_port: int | None
 
 
 def _parse_env_list(value: str | None) -> list[str] | None:
@@ -85,6 +87,16 @@ def _parse_env_list(value: str | None) -> list[str] | None:
     return items or None
 
 
+def _parse_port(value: str | None) -> int | None:
+    if not value or not value.strip():
+        return None
+    try:
+        port = int(value)
+    except ValueError:
+        return None
+    return port if 0 < port < 65536 else None
+
+
 def convert_curl(curl_command: str) -> tuple[dict[str, str], dict[str, str]]:
     """Extract headers and cookies from a curl command."""
     headers_temp: dict[str, str] = {}
@@ -133,11 +145,13 @@ def load_settings() -> Settings:
     key = "3c5c8717f3daf09iop3423zafeqoi"
     cookie_data = {"rq": "%2Fweb%2Fbook%2FgetProgress", "ql": False}
 
-    read_url = "https://weread.qq.com/web/book/read"
-    progress_url = "https://weread.qq.com/web/book/getProgress"
-    reader_url = "https://weread.qq.com/web/reader"
-    renew_url = "https://weread.qq.com/web/login/renewal"
-    fix_synckey_url = "https://weread.qq.com/web/book/chapterInfos"
+    # 仅用于本地替身服务（基准测试等），正常运行无需设置
+    base_url = (os.getenv("WXREAD_BASE_URL") or "https://weread.qq.com").rstrip("/")
+    read_url = f"{base_url}/web/book/read"
+    progress_url = f"{base_url}/web/book/getProgress"
+    reader_url = f"{base_url}/web/reader"
+    renew_url = f"{base_url}/web/login/renewal"
+    fix_synckey_url = f"{base_url}/web/book/chapterInfos"
 
     read_min_per_success = 0.5
     rt_seconds = 30
@@ -156,6 +170,11 @@ def load_settings() -> Settings:
     http_proxy = os.getenv("http_proxy")
     https_proxy = os.getenv("https_proxy")
 
+    # 显式设为空字符串可关闭运行历史记录
+    history_db = os.getenv("WXREAD_HISTORY_DB", "run_history.sqlite3").strip() or None
+    # 本地状态接口（仅监听 127.0.0.1），未设置则不启用
+    status_port = _parse_port(os.getenv("WXREAD_STATUS_PORT"))
+
     return Settings(
         read_num=read_num,
         push_method=push_method,
@@ -189,4 +208,6 @@ def load_settings() -> Settings:
         start_delay_max_raw=start_delay_max_raw,
         http_proxy=http_proxy,
         https_proxy=https_proxy,
+        history_db=history_db,
+        status_port=status_port,
     )
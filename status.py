@@ -0,0 +1,82 @@
+import asyncio
+import logging
+from typing import Any, Callable
+
+import codec
+
+
+logger = logging.getLogger(__name__)
+
+STATUS_HOST = "127.0.0.1"
+REQUEST_TIMEOUT_SECONDS = 5.0
+
+
+class StatusServer:
+    """Minimal loopback-only HTTP endpoint serving a JSON status snapshot.
+
+    Runs on the caller's event loop; ``snapshot`` is only evaluated when a
+    client actually polls, so an idle server costs nothing per read.
+    """
+
+    def __init__(self, port: int, snapshot: Callable[[], dict[str, Any]]) -> None:
+        self.port = port
+        self.snapshot = snapshot
+        self._server: asyncio.Server | None = None
+
+    async def __aenter__(self) -> "StatusServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.stop()
+
+    async def start(self) -> None:
+        try:
+            self._server = await asyncio.start_server(
+                self._handle, host=STATUS_HOST, port=self.port
+            )
+        except OSError as exc:
+            logger.warning("⚠️ 状态接口启动失败(port=%s): %s", self.port, exc)
+            return
+        port = self._server.sockets[0].getsockname()[1]
+        logger.info("🔭 状态接口：http://%s:%s/status", STATUS_HOST, port)
+
+    async def stop(self) -> None:
+        if self._server is None:
+            return
+        self._server.close()
+        await self._server.wait_closed()
+        self._server = None
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            request_line = await asyncio.wait_for(
+                reader.readline(), REQUEST_TIMEOUT_SECONDS
+            )
+            while True:
+                line = await asyncio.wait_for(reader.readline(), REQUEST_TIMEOUT_SECONDS)
+                if line in (b"\r\n", b"\n", b""):
+                    break
+            parts = request_line.decode("latin-1").split()
+            path = parts[1].split("?", 1)[0] if len(parts) >= 2 else ""
+            if parts and parts[0] == "GET" and path in ("/", "/status"):
+                status, body = "200 OK", codec.dumps(self.snapshot(), default=str)
+            else:
+                status, body = "404 Not Found", b'{"error":"not found"}'
+            writer.write(
+                f"HTTP/1.1 {status}\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Cache-Control: no-store\r\n"
+                "Connection: close\r\n\r\n".encode("ascii")
+                + body
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        except Exception as exc:
+            logger.warning("⚠️ 状态接口处理失败: %s", exc)
+        finally:
+            writer.close()
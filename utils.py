@@ -1,9 +1,11 @@
 import hashlib
-import json
+import math
 import random
 import urllib.parse
 from typing import Any
 
+import codec
+
 
 def encode_weread_id(value: str | int) -> str:
     """Encode WeRead IDs (from client logic)."""
@@ -67,6 +69,15 @@ def format_minutes(value: float) -> str:
     return f"{value:.1f}"
 
 
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile; returns 0.0 for an empty sample."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
 def extract_safe_info(res_data: Any) -> dict[str, Any] | None:
     if isinstance(res_data, dict):
         keys = ("errcode", "errmsg", "code", "message", "succ")
@@ -110,7 +121,7 @@ def extract_json_after_marker(text: str, marker: str) -> dict[str, Any] | None:
     if not blob:
         return None
     try:
-        return json.loads(blob)
+        return codec.loads(blob)
     except ValueError:
         return None
 
@@ -129,7 +140,7 @@ def extract_json_after_key(text: str, key: str) -> dict[str, Any] | None:
     if not blob:
         return None
     try:
-        return json.loads(blob)
+        return codec.loads(blob)
     except ValueError:
         return None
 